@@ -3,14 +3,18 @@ from __future__ import annotations
 
 import pygame as pg
 from pathlib import Path
-from typing import Dict, Tuple, List, FrozenSet, Optional, Set
+from typing import Callable, Dict, Tuple, List, Optional
 import io
-import requests
+import hashlib
+import tempfile
+from array import array
+from urllib.request import urlopen
 import csv # For CSV export
-import itertools # Need this for combinations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from models import Player, Treasure, Grid, Coalition, load_clues, load_board
-from shapley import shapley_sample
+from models import Player, Coalition, REVEAL_MISS, REVEAL_HIT, coalition_members, mask_has, load_clues, load_board
+from shapley import shapley_exact
 from ui import Button, GridView, LedgerPanel, Font, FontSmall, PlayerPanel, TextInput, COLOR_INACTIVE # Added COLOR_INACTIVE
 
 # ---------------------------------------------------------------------------
@@ -32,6 +36,8 @@ LEDGER_H = WINDOW_H - LEDGER_Y - BUTTON_H - PANEL_MARGIN * 2 # Correctly uses PA
 RIGHT_PANEL_X = GRID_PX + GRID_LEFT_MARGIN + PANEL_MARGIN # Adjusted to account for grid left margin
 RIGHT_PANEL_W = WINDOW_W - RIGHT_PANEL_X - PANEL_MARGIN # Adjusted to account for new X and right margin
 
+SFX_CACHE_DIR = Path(tempfile.gettempdir()) / "bt_sfx" # Downloaded sounds are kept here between runs
+
 # Game States
 SETUP = "SETUP"
 AWAIT_COMMIT = "AWAIT_COMMIT" # Waiting for players to toggle commits and press Lock
@@ -39,35 +45,89 @@ AWAIT_GUESS = "AWAIT_GUESS"   # Coalition locked, clues revealed, waiting for gr
 REVEAL = "REVEAL"             # Brief state to show hit/miss before resetting
 END = "END"
 
+# Event types each state's handler reacts to; _set_state has SDL drop everything else at the source.
+# Clicks, hover and window events matter everywhere; typing only on setup (names) and end (Esc).
+_BASE_EVENTS = (pg.QUIT, pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION, pg.VIDEOEXPOSE, pg.WINDOWEXPOSED)
+STATE_EVENTS = {
+    SETUP: _BASE_EVENTS + (pg.KEYDOWN, pg.TEXTINPUT),
+    AWAIT_COMMIT: _BASE_EVENTS,
+    AWAIT_GUESS: _BASE_EVENTS,
+    REVEAL: _BASE_EVENTS,
+    END: _BASE_EVENTS + (pg.KEYDOWN,),
+}
+
 MAX_PLAYERS = 6
 MIN_PLAYERS = 3
 
 class Game:
     # ---------- Lifecycle ---------------------------------------------------
     def __init__(self) -> None:
-        pg.mixer.init()
-        pg.font.init() # Ensure font module is initialized
+        if not pg.font.get_init(): # ui.py already initialises it on import
+            pg.font.init()
         self.screen = pg.display.set_mode((WINDOW_W, WINDOW_H))
         pg.display.set_caption("Battleship Treasure Hunt")
         self.clock = pg.time.Clock()
         self.running = True
         self.font = Font # Use the font from ui.py
+        self._text_cache: Dict[Tuple[int, str, Tuple[int, int, int]], pg.Surface] = {} # (id(font), text, color) -> surface
+        # --- Dirty-rect rendering ---
+        self._dirty: List[pg.Rect] = [self.screen.get_rect()] # Regions to push on the next display update
+        self._flip_pending = True # Whole screen was repainted; push it with flip() rather than rects
+        self._prev_state: Optional[str] = None # State painted last frame; a change forces a full repaint
+        self._full_redraw = True # Set when something outside the self-tracking widgets changes
+        # Shapley payouts run here so the window keeps repainting; results are collected in update()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payouts")
+
+        self._reset_state()
+
+        # --- Sound ---
+        self.sound_urls = {
+            "hit": "https://raw.githubusercontent.com/simondevyoutube/ProceduralTerrain_Part1/master/tutorial/sounds/explosion1.wav",
+            "miss": "https://raw.githubusercontent.com/simondevyoutube/ProceduralTerrain_Part1/master/tutorial/sounds/blip1.wav",
+            "coin": "https://raw.githubusercontent.com/freesound/freesound/develop/freesound/data/sounds/coin1.wav", # Example coin sound
+            "commit": "https://raw.githubusercontent.com/freesound/freesound/develop/freesound/data/sounds/click1.wav", # Example commit sound
+        }
+        # WAV bytes are fetched by a background thread so startup never waits on the
+        # network; the mixer and Sound objects are set up on first use in _play_sfx.
+        self._sfx_data: Dict[str, Optional[bytes]] = {} # name -> bytes (None = unavailable) once fetched
+        self.sfx: Dict[str, Optional[pg.mixer.Sound]] = {}
+        self._mixer_inited = False
+        # One daemon thread per sound so the downloads overlap and never hold up exit
+        for name, url in self.sound_urls.items():
+            threading.Thread(target=self._prefetch_sound, args=(name, url), daemon=True).start()
+
+    def _reset_state(self) -> None:
+        """Put every per-game field back to a fresh setup screen; display, fonts and sounds are kept."""
+        self._full_redraw = True
 
         # --- Game State ---
-        self.state = SETUP
+        self._set_state(SETUP) # Also binds self._event_handler
         self.players: List[Player] = []
-        self.grid: Grid = []
+        self._short_names: List[str] = [] # players[i].get_short_name(), built once at game start
+        # Board as flat row-major arrays (index r * grid_size + c): coin value (0 = empty) and claimed flag
+        self.treasure_value = array('h')
+        self.treasure_claimed = bytearray()
+        self.claimed_cells: List[int] = [] # Indices set in treasure_claimed, in claim order (for GridView)
         self.grid_size = 10 # Default, can be changed in setup
+        self.unclaimed_treasures = 0 # Decremented on each hit; game ends at 0
         self.ledger: Dict[Coalition, int] = {}
-        self.revealed: List[Tuple[int, int, bool]] = [] # (r, c, hit)
+        self._ledger_items_cache: List[Tuple[Coalition, int]] = [] # list(self.ledger.items()) for LedgerPanel
+        self._ledger_dirty = True # Rebuild _ledger_items_cache before the next ledger draw
+        self.reveal_map = bytearray() # Flat like the board: 0, REVEAL_MISS or REVEAL_HIT per cell
         self.commits: List[bool] = []
-        self.current_coalition: Coalition = frozenset()
+        self.current_coalition: Coalition = 0 # Bitmask of committed players once locked
+        self._coalition_str = "None" # Top-bar label for current_coalition, rebuilt on lock/reset
         self.coalition_locked = False
         self.round = 0
         self.payouts: Optional[List[float]] = None
+        self.calculating_payouts = False # True from _end_game until update() collects the result
+        self._payout_future: Optional[Future] = None
         self.last_guess_result: Optional[Tuple[int, int, bool, int]] = None # (r, c, hit, coins)
-        self.allowed_guesses: set[tuple[int,int]] | None = None  # Allowed cells after lock
-        self.clue_positions = []  # List of (player_idx, positions, is_restrictive) for grid highlighting
+        self.allowed_guesses: Optional[int] = None  # Allowed cells after lock, as a board bitmask (bit r * grid_size + c)
+        self._player_masks: List[int] = [] # Each player's allowed cells as a board bitmask
+        self._total_cells = 0 # grid_size * grid_size, fixed once the board is loaded
+        self._full_mask = 0 # Board bitmask with every cell set
+        self.clue_positions = []  # List of (player_idx, cell bitmask, is_restrictive) for grid highlighting
         self.setup_error_message = "" # To display errors on setup screen
 
         # --- Setup UI Widgets ---
@@ -99,44 +159,86 @@ class Game:
         # End Screen UI (initialized in _end_game)
         self.export_button: Optional[Button] = None
         self.restart_button: Optional[Button] = None
-
-        # --- Sound ---
-        self.sound_urls = {
-            "hit": "https://raw.githubusercontent.com/simondevyoutube/ProceduralTerrain_Part1/master/tutorial/sounds/explosion1.wav",
-            "miss": "https://raw.githubusercontent.com/simondevyoutube/ProceduralTerrain_Part1/master/tutorial/sounds/blip1.wav",
-            "coin": "https://raw.githubusercontent.com/freesound/freesound/develop/freesound/data/sounds/coin1.wav", # Example coin sound
-            "commit": "https://raw.githubusercontent.com/freesound/freesound/develop/freesound/data/sounds/click1.wav", # Example commit sound
-        }
-        self.sfx: Dict[str, Optional[pg.mixer.Sound]] = {
-            name: self._load_wav(name, url) for name, url in self.sound_urls.items()
-        }
+        self._end_bg: Optional[pg.Surface] = None # End-screen text below the top bar, composited by _build_end_screen
+        self._end_screen_calculating = False # calculating_payouts as of the last build
 
     # ---------- Helpers -----------------------------------------------------
+    def _prefetch_sound(self, name: str, url: str):
+        """Background thread: fetch one sound's bytes into ``self._sfx_data``."""
+        self._sfx_data[name] = self._fetch_wav(name, url) # Single dict store, safe to read from main thread
+
+    @staticmethod
+    def _sfx_cache_path(url: str) -> Path:
+        """Disk cache file for *url*; keyed by URL so a changed source is fetched afresh."""
+        return SFX_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.wav"
+
     @staticmethod
-    def _load_wav(name: str, url: str) -> Optional[pg.mixer.Sound]:
-        print(f"Attempting to load sound '{name}' from {url}...")
+    def _fetch_wav(name: str, url: str) -> Optional[bytes]:
+        cache_path = Game._sfx_cache_path(url)
+        if cache_path.exists():
+            try:
+                return cache_path.read_bytes()
+            except OSError as e:
+                print(f"Cached sound '{name}' unreadable, re-downloading: {e}")
+        print(f"Attempting to download sound '{name}' from {url}...")
         if not url:
             print(f"Warning: No URL provided for sound '{name}'.")
             return None
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            wav_data = io.BytesIO(response.content)
-            sound = pg.mixer.Sound(wav_data)
-            print(f"Successfully loaded sound '{name}'.")
-            return sound
-        except requests.exceptions.RequestException as e:
+            with urlopen(url, timeout=10) as response: # Raises HTTPError on non-2xx status
+                data = response.read()
+            try:
+                SFX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_path.write_bytes(data)
+            except OSError as e:
+                print(f"Warning: Could not cache sound '{name}': {e}")
+            return data
+        except OSError as e: # URLError, HTTPError and socket timeouts all derive from OSError
             print(f"Error downloading sound '{name}': {e}")
             return None
+        except Exception as e:
+             print(f"Unexpected error downloading sound '{name}': {e}")
+             return None
+
+    @staticmethod
+    def _load_wav(name: str, url: str, data: Optional[bytes]) -> Optional[pg.mixer.Sound]:
+        if data is None:
+            return None
+        try:
+            sound = pg.mixer.Sound(io.BytesIO(data))
+            print(f"Successfully loaded sound '{name}'.")
+            return sound
         except pg.error as e:
             print(f"Error loading sound data for '{name}': {e}")
+            # Drop a bad cached copy so the next run downloads it again
+            Game._sfx_cache_path(url).unlink(missing_ok=True)
             return None
-        except Exception as e:
-             print(f"Unexpected error loading sound '{name}': {e}")
-             return None
+
+    def _render_cached(self, text: str, color: Tuple[int, int, int], font: Optional[pg.font.Font] = None) -> pg.Surface:
+        """Return *font* (default ``self.font``) rendering of *text*, rasterising each combination only once."""
+        font = font or self.font
+        key = (id(font), text, tuple(color))
+        surf = self._text_cache.get(key)
+        if surf is None:
+            surf = font.render(text, True, color)
+            self._text_cache[key] = surf
+        return surf
 
     def _play_sfx(self, name: str):
-        if name in self.sfx and self.sfx[name]:
+        if not self._mixer_inited:
+            self._mixer_inited = True
+            try:
+                if not pg.mixer.get_init():
+                    pg.mixer.init()
+            except pg.error as e:
+                print(f"Audio unavailable, sounds disabled: {e}")
+                self.sfx = dict.fromkeys(self.sound_urls) # Never try to load them
+        if name not in self.sfx:
+            if name not in self._sfx_data:
+                return # Still downloading; stay silent rather than block
+            # Load on first use; a failed load is remembered as None and not retried
+            self.sfx[name] = self._load_wav(name, self.sound_urls.get(name, ""), self._sfx_data[name])
+        if self.sfx[name]:
             self.sfx[name].play()
         else:
             print(f"Debug: Sound '{name}' not loaded or unavailable.")
@@ -149,16 +251,19 @@ class Game:
             input_h = 30
             new_input = TextInput(pg.Rect(0, 0, input_w, input_h), f"Player {next_player_num} Name:")
             self.player_name_inputs.append(new_input)
+            self._full_redraw = True # Setup layout grows by one row
             print(f"Added input for player {next_player_num}")
         else:
             print("Maximum number of players reached.")
             self.setup_error_message = f"Maximum {MAX_PLAYERS} players allowed."
+            self._full_redraw = True
 
     # ---------- State Transition Actions ------------------------------------
 
     def _start_game_action(self):
         print("Start Game button clicked")
         self.setup_error_message = "" # Clear previous errors
+        self._full_redraw = True # Either an error message or a new screen
 
         # --- Get Player Names & Infer Count ---
         entered_names = []
@@ -214,29 +319,41 @@ class Game:
         # --- Override Names ---
         for i, name in enumerate(entered_names):
             self.players[i].name = name
+        self._short_names = [p.get_short_name() for p in self.players] # Names are final from here on
         print(f"Final player list: { [p.name for p in self.players] }")
 
         # --- Initialize Play State ---
         print(f"Starting game with {num_players} players: {[p.name for p in self.players]}")
         # Assuming board.json exists and is valid
         try:
-            self.grid = load_board(Path("board.json"), self.grid_size) 
+            self.treasure_value = load_board(Path("board.json"), self.grid_size)
         except Exception as e:
             self.setup_error_message = f"Error loading board.json: {e}"
             print(self.setup_error_message)
             self.players = [] # Reset players
             return
+        self.treasure_claimed = bytearray(len(self.treasure_value))
+        self.claimed_cells = []
+        self.unclaimed_treasures = sum(1 for value in self.treasure_value if value > 0) # Same rule as a hit in _handle_grid_click
         
         self.ledger = {}
-        self.revealed = []
+        self._ledger_dirty = True
+        self.reveal_map = bytearray(len(self.treasure_value))
         self.commits = [False] * len(self.players) # Initialize commits based on final player count
         self.round = 1
-        self.current_coalition = frozenset()
+        self.current_coalition = 0
+        self._coalition_str = "None"
         self.coalition_locked = False
         self.last_guess_result = None
         self.allowed_guesses = None
         self.clue_positions = []
 
+        self._total_cells = self.grid_size * self.grid_size
+        self._full_mask = (1 << self._total_cells) - 1
+
+        # Clues are fixed for the game; each player's allowed cells come back as one int bitmask
+        self._player_masks = [p.allowed_positions(self.grid_size) for p in self.players]
+
         # Initialize Play UI elements
         self.grid_view = GridView(
             (GRID_LEFT_MARGIN, TopBarH + GRID_TOP_MARGIN),
@@ -251,7 +368,7 @@ class Game:
         )
         self.ledger_panel = LedgerPanel(pg.Rect(RIGHT_PANEL_X, LEDGER_Y, RIGHT_PANEL_W, LEDGER_H))
 
-        self.state = AWAIT_COMMIT
+        self._set_state(AWAIT_COMMIT)
         print("Transitioning to AWAIT_COMMIT state.")
 
     def _handle_commit_toggle(self, player_index: int):
@@ -270,27 +387,32 @@ class Game:
             print("Not in commit phase.")
             return
         
-        committed_indices = {i for i, committed in enumerate(self.commits) if committed}
-        if not committed_indices:
+        mask = 0
+        for i, committed in enumerate(self.commits):
+            if committed:
+                mask |= 1 << i
+        if not mask:
             print("No players committed. Cannot lock empty coalition.")
             return
 
-        self.current_coalition = frozenset(committed_indices)
+        self.current_coalition = mask
+        members = list(coalition_members(mask)) # Ascending player indices
+        self._coalition_str = ", ".join(str(i) for i in members)
         self.coalition_locked = True
         if self.player_panel:
-             self.player_panel.reveal_clues(self.current_coalition) # Show clues for committed players
+             self.player_panel.reveal_clues(set(members)) # Show clues for committed players
 
         # Build allowed_guesses from committed players' clues
-        allowed = set()
+        allowed = 0
         # Store clue-specific positions for grid highlighting
         self.clue_positions = []
-        for idx in self.current_coalition:
-            player_positions = self.players[idx].allowed_positions(self.grid_size)
-            self.clue_positions.append((idx, player_positions, len(player_positions) < self.grid_size * self.grid_size))
-            allowed |= player_positions
+        for idx in members:
+            player_mask = self._player_masks[idx]
+            self.clue_positions.append((idx, player_mask, player_mask != self._full_mask)) # Restrictive unless it allows every cell
+            allowed |= player_mask
         self.allowed_guesses = allowed or None
-        self.state = AWAIT_GUESS
-        print(f"Coalition locked: {self.current_coalition}. Waiting for guess.")
+        self._set_state(AWAIT_GUESS)
+        print(f"Coalition locked: {members}. Waiting for guess.")
 
     def _handle_grid_click(self, r: int, c: int):
         if self.state != AWAIT_GUESS:
@@ -301,18 +423,20 @@ class Game:
              return
 
         # Restrict guesses to allowed positions
-        if self.allowed_guesses is not None and (r, c) not in self.allowed_guesses:
+        if self.allowed_guesses is not None and not mask_has(self.allowed_guesses, r, c, self.grid_size):
             print(f"({r},{c}) not permitted by your committed clues.")
             return
 
-        print(f"Grid clicked at ({r}, {c}) by coalition {self.current_coalition}")
-        cell = self.grid[r][c]
-        hit = bool(cell and not cell.claimed)
+        print(f"Grid clicked at ({r}, {c}) by coalition {self._coalition_str}")
+        idx = r * self.grid_size + c
+        hit = self.treasure_value[idx] > 0 and not self.treasure_claimed[idx]
         coins = 0
 
         if hit:
-            cell.claimed = True
-            coins = cell.value
+            self.treasure_claimed[idx] = 1
+            self.claimed_cells.append(idx)
+            coins = self.treasure_value[idx]
+            self.unclaimed_treasures -= 1
             self._play_sfx("hit")
             self._play_sfx("coin") # Play coin sound on hit
         else:
@@ -320,11 +444,15 @@ class Game:
 
         # Update Ledger
         self.ledger[self.current_coalition] = self.ledger.get(self.current_coalition, 0) + coins
-        self.revealed.append((r, c, hit))
+        self.reveal_map[idx] = REVEAL_HIT if hit else REVEAL_MISS
+        self._ledger_dirty = True
+        self.ledger_panel.needs_redraw = True
+        if self.grid_view:
+            self.grid_view.needs_redraw = True
         self.last_guess_result = (r, c, hit, coins)
 
         # Check for game end condition
-        if all(t is None or t.claimed for row in self.grid for t in row):
+        if self.unclaimed_treasures == 0:
             print("All treasures claimed!")
             self._end_game()
         else:
@@ -335,12 +463,14 @@ class Game:
 
     def _reset_for_next_round(self):
         self.round += 1
-        self.current_coalition = frozenset()
+        self.current_coalition = 0
+        self._coalition_str = "None"
         self.coalition_locked = False
         self.commits = [False] * len(self.players) # Reset commits
+        self._ledger_dirty = True
         if self.player_panel:
              self.player_panel.reset_view() # Hide clues, reset toggles visually
-        self.state = AWAIT_COMMIT
+        self._set_state(AWAIT_COMMIT)
         self.allowed_guesses = None
         # Clear clue positions
         self.clue_positions = []
@@ -354,25 +484,34 @@ class Game:
     def _end_game(self):
         if self.state == END: return # Already ended
         print("Ending game and calculating payouts...")
-        self.state = END
+        self._set_state(END)
         
         # --- Calculate the characteristic function based on clues: number of eliminated positions by coalition ---
         values = self._calculate_clues_based_characteristic_function() # Use the new function
         
         weights = [p.weight for p in self.players]
+        # Compute on the worker thread so the window keeps repainting meanwhile
+        self.payouts = None
+        self.calculating_payouts = True
+        self._payout_future = self._executor.submit(self._compute_payouts, values, weights)
+
+        # Initialize End Screen UI (or ensure they exist)
+        self._initialize_end_buttons()
+
+    def _compute_payouts(self, values: Dict[Coalition, int], weights: List[int]) -> Optional[List[float]]:
+        """Worker thread body: return Shapley payouts, or None if the calculation failed."""
         try:
-             self.payouts = shapley_sample(values, len(self.players), weights, samples=10000)
-             print(f"Shapley Payouts calculated (clues-based): {self.payouts}")
+             # 2^n coalitions for at most MAX_PLAYERS players: exact beats sampling
+             payouts = shapley_exact(values, len(weights), weights)
+             print(f"Shapley Payouts calculated (clues-based, exact): {payouts}")
              # Verification: Check if sum of payouts roughly equals ledger total
              total_ledger_value = sum(self.ledger.values()) # Get actual ledger total
              print(f"Total treasure found (ledger sum) = {total_ledger_value}") # Use ledger total
-             print(f"Sum of calculated Shapley payouts = {sum(self.payouts):.2f}")
+             print(f"Sum of calculated Shapley payouts = {sum(payouts):.2f}")
         except Exception as e:
              print(f"Error calculating Shapley values: {e}")
-             self.payouts = None # Indicate calculation failure
-
-        # Initialize End Screen UI (or ensure they exist)
-        self._initialize_end_buttons()
+             payouts = None # Indicate calculation failure
+        return payouts
 
     def _initialize_end_buttons(self):
         """Helper to create end game buttons if they don't exist."""
@@ -381,7 +520,7 @@ class Game:
         if not hasattr(self, 'restart_button') or self.restart_button is None:
             self.restart_button = Button(pg.Rect(WINDOW_W // 2 + 10, WINDOW_H - 60, 150, 30), "Restart Game", self._restart_game)
 
-    def _calculate_clues_based_characteristic_function(self) -> Dict[FrozenSet[int], int]:
+    def _calculate_clues_based_characteristic_function(self) -> Dict[Coalition, int]:
         """Calculates v(S) based on clues: number of eliminated positions by coalition."""
         print("Calculating clues-based characteristic function v(S)...")
         if not self.players:
@@ -389,52 +528,47 @@ class Game:
             return {}
 
         n = len(self.players)
-        v: Dict[FrozenSet[int], int] = {}
-        grid_size = self.grid_size
-        total_cells = grid_size * grid_size
-
-        # Iterate through all possible coalition sizes (0 to n)
-        for k in range(n + 1):
-            # Iterate through all coalitions S of size k
-            for coalition_indices_tuple in itertools.combinations(range(n), k):
-                S = frozenset(coalition_indices_tuple)
-
-                if not S:
-                    v[S] = 0
-                else:
-                    # Intersection of allowed positions of players in S
-                    intersect_positions = {(r, c) for r in range(grid_size) for c in range(grid_size)}
-                    for idx in S:
-                        intersect_positions &= self.players[idx].allowed_positions(grid_size)
-                    allowed_count = len(intersect_positions)
-                    # v(S) is number of eliminated positions
-                    v[S] = total_cells - allowed_count
+        v: Dict[Coalition, int] = {}
+        total_cells = self._total_cells
+
+        # Subset DP over coalition bitmasks: inter[S] = inter[S minus its lowest member] & that member's
+        # cells, so each coalition costs a single AND on top of one already computed
+        inter = [0] * (1 << n)
+        inter[0] = self._full_mask # Empty coalition rules nothing out
+        v[0] = 0
+        for S in range(1, 1 << n):
+            low = S & -S
+            i = low.bit_length() - 1
+            inter[S] = inter[S ^ low] & self._player_masks[i]
+            # v(S) is number of eliminated positions
+            v[S] = total_cells - bin(inter[S]).count("1")
 
         print("Finished calculating clues-based v(S).")
         return v
 
     def _export_results(self):
         if self.state != END: return
+        if self.calculating_payouts:
+            print("Payouts are still being calculated; try exporting again shortly.")
+            return
         print("Exporting results...")
         filename = "game_results.csv"
         try:
-            with open(filename, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                # Header
-                writer.writerow(["Coalition", "Total Coins Earned"])
-                # Ledger Data
-                for coalition_indices, coins in self.ledger.items():
-                     coalition_names = "+".join(sorted(self.players[i].get_short_name() for i in coalition_indices))
-                     writer.writerow([coalition_names, coins])
-                # Empty row separator
-                writer.writerow([])
-                # Payouts
-                writer.writerow(["Player", "Shapley Value (Coins)"])
-                if self.payouts:
-                     for i, player in enumerate(self.players):
-                          writer.writerow([player.name, f"{self.payouts[i]:.2f}"])
-                else:
-                     writer.writerow(["Calculation Error", "N/A"])
+            # Header, then ledger data
+            rows = [["Coalition", "Total Coins Earned"]]
+            rows.extend(
+                ["+".join(sorted(self._short_names[i] for i in coalition_members(mask))), coins]
+                for mask, coins in self.ledger.items()
+            )
+            # Empty row separator, then payouts
+            rows.append([])
+            rows.append(["Player", "Shapley Value (Coins)"])
+            if self.payouts:
+                rows.extend([player.name, f"{payout:.2f}"] for player, payout in zip(self.players, self.payouts))
+            else:
+                rows.append(["Calculation Error", "N/A"])
+            with open(filename, 'w', newline='', buffering=1 << 16) as csvfile:
+                csv.writer(csvfile).writerows(rows)
             print(f"Results exported successfully to {filename}")
         except Exception as e:
             print(f"Error exporting results to CSV: {e}")
@@ -442,19 +576,23 @@ class Game:
 
     def _restart_game(self):
         print("Restarting game...")
-        # Reset all state by creating a new Game instance perhaps?
-        # Or manually reset all variables:
-        self.__init__() # Re-initialize the game object
+        self._text_cache.clear() # Drop surfaces for the old players' names
+        self._reset_state() # Keeps the window and loaded sounds
 
 
     # ---------- Public API --------------------------------------------------
     def run(self) -> None:
         while self.running:
             # --- Event Handling ---
-            events = pg.event.get()
+            # Sleep until input arrives; the timeout still lets worker-thread results show up
+            events = [pg.event.wait(timeout=100)] + pg.event.get()
+            if events[0].type == pg.NOEVENT: # wait() timed out
+                events.pop(0)
             for event in events:
                 if event.type == pg.QUIT:
                     self.running = False
+                elif event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                    self._full_redraw = True # Window contents were lost; dirty rects are not enough
                 # Pass event to the handler for the current state
                 self.handle_event(event)
 
@@ -462,43 +600,96 @@ class Game:
             self.update() # Currently empty, but good practice
 
             # --- Drawing ---
-            self.draw() # Call main draw method
-            pg.display.flip()
-
-            self.clock.tick(60) # Limit FPS
-
+            # Widgets only change while handling events; the payout worker sets _full_redraw
+            if events or self._full_redraw:
+                self.draw() # Repaints only what changed
+            if self._flip_pending:
+                pg.display.flip()
+                self._flip_pending = False
+                self._dirty.clear()
+            elif self._dirty: # Idle frames push nothing to the display
+                pg.display.update(self._dirty)
+                self._dirty.clear()
+
+            self.clock.tick(60) # Caps redraws during bursts of input
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
         pg.quit()
 
 
     def handle_event(self, event: pg.event.Event) -> None:
-        """Delegate event handling based on the current game state."""
-        if self.state == SETUP:
-            self._handle_setup_event(event)
-        elif self.state == AWAIT_COMMIT:
-            self._handle_await_commit_event(event)
-        elif self.state == AWAIT_GUESS:
-            self._handle_await_guess_event(event)
-        elif self.state == REVEAL: # Currently unused, resets directly
-             pass # Could add a timer here
-        elif self.state == END:
-            self._handle_end_event(event)
+        """Delegate event handling to the handler bound for the current game state."""
+        self._event_handler(event)
+
+    def _set_state(self, new_state: str) -> None:
+        """Switch to *new_state* and bind its event handler once, not per event."""
+        self.state = new_state
+        # Only queue events this state handles; SDL drops the rest before they reach Python.
+        # MOUSEMOTION drives button hover, TEXTINPUT fills KEYDOWN.unicode for name entry.
+        pg.event.set_blocked(None)
+        pg.event.set_allowed(STATE_EVENTS[new_state])
+        self._event_handler = {
+            SETUP: self._handle_setup_event,
+            AWAIT_COMMIT: self._handle_await_commit_event,
+            AWAIT_GUESS: self._handle_await_guess_event,
+            REVEAL: lambda event: None, # Currently unused, resets directly
+            END: self._handle_end_event,
+        }[new_state]
 
     def update(self) -> None:
         """Update game logic (e.g., animations, timers)."""
-        # Placeholder for future updates
-        pass
+        # Publish finished payouts on the main thread; a restart drops the future, discarding stale results
+        if self._payout_future is not None and self._payout_future.done():
+            self.payouts = self._payout_future.result()
+            self._payout_future = None
+            self.calculating_payouts = False
+            self._full_redraw = True # Swap the "Calculating" line for the results
 
     def draw(self) -> None:
-        """Draw the current game state to the screen."""
-        self.screen.fill(BG_COLOR)
-        self._draw_top_bar() # Draw common top bar
+        """Draw what changed since the last frame, recording regions in ``self._dirty``."""
+        if self._full_redraw or self.state != self._prev_state:
+            self._full_redraw = False
+            self._prev_state = self.state
+            self.screen.fill(BG_COLOR)
+            self._draw_top_bar() # Draw common top bar
+
+            if self.state == SETUP:
+                self._draw_setup()
+            elif self.state in [AWAIT_COMMIT, AWAIT_GUESS, REVEAL]:
+                self._draw_play()
+            elif self.state == END:
+                self._draw_end()
+            self._dirty = [self.screen.get_rect()]
+            self._flip_pending = True
+            return
 
+        # Same screen as last frame: repaint only widgets that flagged a change
+        for widget, paint in self._self_tracking_widgets():
+            if widget.needs_redraw:
+                self.screen.set_clip(widget.rect)
+                paint()
+                self.screen.set_clip(None)
+                self._dirty.append(widget.rect.copy())
+
+    def _self_tracking_widgets(self) -> List[Tuple[object, Callable[[], None]]]:
+        """Widgets on the current screen that can repaint alone, paired with their draw call."""
         if self.state == SETUP:
-            self._draw_setup()
-        elif self.state in [AWAIT_COMMIT, AWAIT_GUESS, REVEAL]:
-            self._draw_play()
+            buttons = [self.start_game_button]
+            if len(self.player_name_inputs) < MAX_PLAYERS:
+                buttons.append(self.add_player_button)
         elif self.state == END:
-            self._draw_end()
+            buttons = [b for b in (self.export_button, self.restart_button) if b]
+        else:
+            buttons = [self.lock_coalition_button, self.end_button]
+        widgets = [(button, lambda b=button: b.draw(self.screen)) for button in buttons]
+
+        if self.state in [AWAIT_COMMIT, AWAIT_GUESS, REVEAL]:
+            if self.grid_view:
+                widgets.append((self.grid_view, self._draw_grid))
+            if self.player_panel:
+                widgets.append((self.player_panel, lambda: self.player_panel.draw(self.screen)))
+            widgets.append((self.ledger_panel, self._draw_ledger))
+        return widgets
 
 
     # ---------- State-Specific Event Handlers -------------------------------
@@ -507,6 +698,8 @@ class Game:
          # Handle input for all current TextInputs
          for input_box in self.player_name_inputs:
               input_box.handle_event(event)
+              if input_box.needs_redraw:
+                   self._full_redraw = True # Boxes resize and re-centre as text changes
          
          # Handle Add Player button click (only if shown)
          if len(self.player_name_inputs) < MAX_PLAYERS:
@@ -559,24 +752,25 @@ class Game:
         # Top bar with game state info
         pg.draw.rect(self.screen, (70, 130, 180), (0, 0, WINDOW_W, TopBarH)) # Steel Blue
         state_text = f"State: {self.state}"
-        state_surf = self.font.render(state_text, True, (255, 255, 255))
-        self.screen.blit(state_surf, (10, 10))
+        state_surf = self._render_cached(state_text, (255, 255, 255))
+        blits = [(state_surf, (10, 10))] # Sent to the screen in one blits() call
 
         if self.state != SETUP:
             round_text = f"Round: {self.round}"
-            round_surf = self.font.render(round_text, True, (255, 255, 255))
-            self.screen.blit(round_surf, (200, 10))
+            round_surf = self._render_cached(round_text, (255, 255, 255))
+            blits.append((round_surf, (200, 10)))
             
-            coalition_text = f"Coalition: {', '.join(str(i) for i in sorted(self.current_coalition)) or 'None'}"
-            coalition_surf = self.font.render(coalition_text, True, (255, 255, 255))
-            self.screen.blit(coalition_surf, (400, 10))
+            coalition_text = f"Coalition: {self._coalition_str}"
+            coalition_surf = self._render_cached(coalition_text, (255, 255, 255))
+            blits.append((coalition_surf, (400, 10)))
+        self.screen.blits(blits, doreturn=False)
 
 
     def _draw_setup(self):
         # Centered Title
-        title_txt = self.font.render("Game Setup", True, (0, 0, 0))
+        title_txt = self._render_cached("Game Setup", (0, 0, 0))
         title_rect = title_txt.get_rect(center=(WINDOW_W // 2, 80))
-        self.screen.blit(title_txt, title_rect)
+        blits = [(title_txt, title_rect)] # Text is blitted together after the widgets
 
         # Position UI elements vertically
         widget_y = 130 # Start a bit lower
@@ -609,108 +803,129 @@ class Game:
 
         # Display Error Message (if any)
         if self.setup_error_message:
-            error_surf = self.font.render(self.setup_error_message, True, (200, 0, 0)) # Red color
+            error_surf = self._render_cached(self.setup_error_message, (200, 0, 0)) # Red color
             error_rect = error_surf.get_rect(center=(WINDOW_W // 2, widget_y))
-            self.screen.blit(error_surf, error_rect)
+            blits.append((error_surf, error_rect))
+        self.screen.blits(blits, doreturn=False)
+
+
+    def _draw_grid(self):
+        self.grid_view.draw(
+            self.screen, 
+            self.reveal_map, 
+            self.treasure_value, 
+            self.treasure_claimed, 
+            self.allowed_guesses, 
+            self.clue_positions if self.state == AWAIT_GUESS else [],
+            players=self.players,
+            claimed=self.claimed_cells,
+        )
 
+    def _draw_ledger(self):
+        if self._ledger_dirty:
+            self._ledger_items_cache = list(self.ledger.items())
+            self._ledger_dirty = False
+        self.ledger_panel.draw(self.screen, self._ledger_items_cache, self._short_names) # Names for coalition labels
 
     def _draw_play(self):
         # Draw Grid
         if self.grid_view:
-            self.grid_view.draw(
-                self.screen, 
-                self.revealed, 
-                self.grid, 
-                self.allowed_guesses, 
-                self.clue_positions if self.state == AWAIT_GUESS else [],
-                players=self.players
-            )
+            self._draw_grid()
 
         # Draw Right Panel Elements
         if self.player_panel:
             self.player_panel.draw(self.screen)
-        self.ledger_panel.draw(self.screen, list(self.ledger.items()), self.players) # Pass players for name mapping
+        self._draw_ledger()
         self.lock_coalition_button.draw(self.screen)
         self.end_button.draw(self.screen)
 
         # Highlight if coalition is locked and clues revealed?
         if self.state == AWAIT_GUESS:
              # Draw instruction text
-             guess_txt = self.font.render("Click on the grid to make a guess!", True, (200, 0, 0))
+             guess_txt = self._render_cached("Click on the grid to make a guess!", (200, 0, 0))
              # Adjust instruction text position based on new GRID_PX
              self.screen.blit(guess_txt, (GRID_LEFT_MARGIN, TopBarH + GRID_TOP_MARGIN + GRID_PX + 5))
 
 
-    def _draw_end(self):
+    def _build_end_screen(self):
+        """Render the static end-screen text once and composite it into ``self._end_bg``."""
+        blits: List[Tuple[pg.Surface, pg.Rect]] = []
+        self._end_screen_calculating = self.calculating_payouts # Layout is stale once this flips
         y = 60 # Start slightly lower for more content
         
         # --- Header --- 
-        header = self.font.render("Game Over", True, (0, 0, 0))
+        header = self._render_cached("Game Over", (0, 0, 0))
         header_rect = header.get_rect(center=(WINDOW_W // 2, y))
-        self.screen.blit(header, header_rect)
+        blits.append((header, header_rect))
         y += 40
 
         # --- Actual Results (Ledger) Section --- 
-        sub_header_ledger = self.font.render("--- Actual Treasure Found ---", True, (0, 0, 128))
+        sub_header_ledger = self._render_cached("--- Actual Treasure Found ---", (0, 0, 128))
         sub_header_ledger_rect = sub_header_ledger.get_rect(center=(WINDOW_W // 2, y))
-        self.screen.blit(sub_header_ledger, sub_header_ledger_rect)
+        blits.append((sub_header_ledger, sub_header_ledger_rect))
         y += 25
         
         if self.ledger:
             total_ledger_val = sum(self.ledger.values())
-            ledger_info_txt = self.font.render(f"Total Found: {total_ledger_val} coins", True, (50, 50, 50))
+            ledger_info_txt = self._render_cached(f"Total Found: {total_ledger_val} coins", (50, 50, 50))
             ledger_info_rect = ledger_info_txt.get_rect(center=(WINDOW_W // 2, y))
-            self.screen.blit(ledger_info_txt, ledger_info_rect)
+            blits.append((ledger_info_txt, ledger_info_rect))
             y += 20
 
-            for coalition_indices, coins in self.ledger.items():
+            for mask, coins in self.ledger.items():
                 # Format coalition names
                 try:
-                    names = "+".join(sorted(self.players[i].get_short_name() for i in coalition_indices))
-                except (IndexError, AttributeError):
+                    names = "+".join(sorted(self._short_names[i] for i in coalition_members(mask)))
+                except IndexError:
                     names = "ErrorCoalition"
                 
-                # Use the imported FontSmall directly
-                ledger_entry_txt = FontSmall.render(f"Coalition [{names}]: {coins} coins", True, (0,0,0))
+                # Use the imported FontSmall, cached like the rest
+                ledger_entry_txt = self._render_cached(f"Coalition [{names}]: {coins} coins", (0,0,0), FontSmall)
                 ledger_entry_rect = ledger_entry_txt.get_rect(center=(WINDOW_W // 2, y))
-                self.screen.blit(ledger_entry_txt, ledger_entry_rect)
+                blits.append((ledger_entry_txt, ledger_entry_rect))
                 y += 18 # Smaller spacing for ledger entries
         else:
-            no_ledger_txt = self.font.render("No treasure found during the game.", True, (100, 100, 100))
+            no_ledger_txt = self._render_cached("No treasure found during the game.", (100, 100, 100))
             no_ledger_rect = no_ledger_txt.get_rect(center=(WINDOW_W // 2, y))
-            self.screen.blit(no_ledger_txt, no_ledger_rect)
+            blits.append((no_ledger_txt, no_ledger_rect))
             y += 20
              
         y += 25 # Add spacing before next section
         
         # --- Shapley Payouts Section --- 
-        sub_header_shapley = self.font.render("--- Shapley Distribution of Found Treasure ---", True, (0, 0, 128))
+        sub_header_shapley = self._render_cached("--- Shapley Distribution of Found Treasure ---", (0, 0, 128))
         sub_header_shapley_rect = sub_header_shapley.get_rect(center=(WINDOW_W // 2, y))
-        self.screen.blit(sub_header_shapley, sub_header_shapley_rect)
+        blits.append((sub_header_shapley, sub_header_shapley_rect))
         y += 25
 
         # Enhanced explanation text for ledger-based value
-        explanation_line1 = FontSmall.render("(Distributes found treasure based on average contribution to successful coalitions.)", True, (80, 80, 80))
+        explanation_line1 = self._render_cached("(Distributes found treasure based on average contribution to successful coalitions.)", (80, 80, 80), FontSmall)
         explanation_rect1 = explanation_line1.get_rect(center=(WINDOW_W // 2, y))
-        self.screen.blit(explanation_line1, explanation_rect1)
+        blits.append((explanation_line1, explanation_rect1))
         y += 16 # Space for next line
-        explanation_line2 = FontSmall.render("(Players get credit if their participation was needed for a score listed above.)", True, (80, 80, 80))
+        explanation_line2 = self._render_cached("(Players get credit if their participation was needed for a score listed above.)", (80, 80, 80), FontSmall)
         explanation_rect2 = explanation_line2.get_rect(center=(WINDOW_W // 2, y))
-        self.screen.blit(explanation_line2, explanation_rect2)
+        blits.append((explanation_line2, explanation_rect2))
         y += 25 
 
-        if self.payouts is not None:
+        if self._end_screen_calculating:
+            calc_txt = self._render_cached("Calculating Shapley payouts...", (50, 50, 50))
+            calc_rect = calc_txt.get_rect(center=(WINDOW_W // 2, y))
+            blits.append((calc_txt, calc_rect))
+            y += 25
+
+        elif self.payouts is not None:
             # Display sum of Shapley values (should equal ledger total)
             total_payout = sum(self.payouts)
-            info_txt = self.font.render(f"Sum of Payouts (Equals Found Treasure): {total_payout:.2f} coins", True, (50, 50, 50))
+            info_txt = self._render_cached(f"Sum of Payouts (Equals Found Treasure): {total_payout:.2f} coins", (50, 50, 50))
             info_rect = info_txt.get_rect(center=(WINDOW_W // 2, y))
-            self.screen.blit(info_txt, info_rect)
+            blits.append((info_txt, info_rect))
             y += 25
             
             # Get set of players who were in any successful coalition
             successful_players = set()
-            for coalition_indices in self.ledger.keys():
-                 successful_players.update(coalition_indices)
+            for mask in self.ledger.keys():
+                 successful_players.update(coalition_members(mask))
 
             # Individual payouts with participation marker
             for i, p in enumerate(self.players):
@@ -719,44 +934,55 @@ class Game:
                      # Check if player was part of any success
                      marker = " [*]" if i in successful_players else "" 
                      txt_str = f"{p.name}: {payout_val:.2f} coins{marker}"
-                     txt = self.font.render(txt_str, True, p.color)
+                     txt = self._render_cached(txt_str, p.color)
                      txt_rect = txt.get_rect(center=(WINDOW_W // 2, y))
-                     self.screen.blit(txt, txt_rect)
+                     blits.append((txt, txt_rect))
                      y += 25
                 else:
                      # Error case (shouldn't happen ideally)
                      print(f"Error: Payout list length mismatch for player {i}")
-                     error_surf = self.font.render(f"ERROR: PAYOUT MISMATCH {i}", True, (255,0,0))
+                     error_surf = self._render_cached(f"ERROR: PAYOUT MISMATCH {i}", (255,0,0))
                      error_rect = error_surf.get_rect(center=(WINDOW_W // 2, y))
-                     self.screen.blit(error_surf, error_rect)
+                     blits.append((error_surf, error_rect))
                      y += 25
                      break 
             
             # Add legend for the marker
-            legend_txt = FontSmall.render("[*] = Member of a scoring coalition", True, (80, 80, 80))
+            legend_txt = self._render_cached("[*] = Member of a scoring coalition", (80, 80, 80), FontSmall)
             legend_rect = legend_txt.get_rect(center=(WINDOW_W // 2, y))
-            self.screen.blit(legend_txt, legend_rect)
+            blits.append((legend_txt, legend_rect))
             y += 20 # Add a bit more space after legend
                     
         else: # self.payouts is None
             # Display calculation error message
-            error_txt = self.font.render("Error calculating Shapley values.", True, (255, 0, 0))
+            error_txt = self._render_cached("Error calculating Shapley values.", (255, 0, 0))
             error_rect = error_txt.get_rect(center=(WINDOW_W // 2, y))
-            self.screen.blit(error_txt, error_rect)
+            blits.append((error_txt, error_rect))
             y += 25
 
         # --- End Screen Buttons --- 
         # Ensure buttons are positioned below content
         button_y = max(y + 20, WINDOW_H - 60) # Position buttons near bottom, but below text
         
-        # Indent the button drawing logic correctly
         if self.export_button:
             self.export_button.rect.y = button_y
             self.export_button.rect.centerx = WINDOW_W // 2 - self.export_button.rect.width // 2 - 10
-            self.export_button.draw(self.screen)
         if self.restart_button: 
             self.restart_button.rect.y = button_y
             self.restart_button.rect.centerx = WINDOW_W // 2 + self.restart_button.rect.width // 2 + 10
+        # One opaque surface for everything below the top bar, so each repaint is a single blit
+        bg = pg.Surface((WINDOW_W, WINDOW_H - TopBarH))
+        bg.fill(BG_COLOR)
+        bg.blits([(surf, rect.move(0, -TopBarH)) for surf, rect in blits], doreturn=False)
+        self._end_bg = bg
+
+    def _draw_end(self):
+        if self._end_bg is None or self._end_screen_calculating != self.calculating_payouts:
+            self._build_end_screen()
+        self.screen.blit(self._end_bg, (0, TopBarH))
+        if self.export_button:
+            self.export_button.draw(self.screen)
+        if self.restart_button: 
             self.restart_button.draw(self.screen)
 
 # --- Entry Point (If this file is run directly, usually in main.py) ---
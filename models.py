@@ -1,58 +1,110 @@
 """Data models and helper loaders for Battleship Treasure Hunt."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Tuple, FrozenSet, Optional
+from typing import Callable, List, Dict, Tuple, Iterator, Optional
 import json
+import random
+
+# ---------- Clue kinds ------------------------------------------------------
+
+# Specialized truth-based clue types, detected once per Player from keywords in the clue text
+CLUE_ANY, CLUE_SHALLOW, CLUE_PRIME, CLUE_PARITY, CLUE_TACTICIAN, CLUE_EAST, CLUE_THREES = range(7)
+
+
+def _clue_kind(clue: str) -> int:
+    """Return the CLUE_* kind whose keywords appear in *clue* (first match wins)."""
+    clue = clue.lower()
+    if "no deeper" in clue or "northern edge" in clue:
+        return CLUE_SHALLOW
+    if "prime sentinel" in clue or "prime" in clue:
+        return CLUE_PRIME
+    if "odd laugh" in clue or "parity" in clue:
+        return CLUE_PARITY
+    if "rank is strictly smaller" in clue or "bows to the column" in clue:
+        return CLUE_TACTICIAN
+    if "east of" in clue and "f" in clue:
+        return CLUE_EAST
+    if "second beat" in clue or "in threes" in clue or "chronomancer" in clue:
+        return CLUE_THREES
+    return CLUE_ANY
+
+
+# Clue kind -> predicate telling whether cell (row, col) is allowed
+_CLUE_CELLS: Dict[int, Callable[[int, int], bool]] = {
+    CLUE_ANY: lambda r, c: True,                    # Fallback: allow full grid
+    CLUE_SHALLOW: lambda r, c: r < 4,               # Shallow-Sea Scout: rows 0 through 3
+    CLUE_PRIME: lambda r, c: c in (2, 3, 5, 7),     # Prime Numerist: columns 2,3,5,7 (0-based primes)
+    CLUE_PARITY: lambda r, c: (r + c) % 2 == 1,     # Parity Jester: (row+col)%2 == 1
+    CLUE_TACTICIAN: lambda r, c: r < c,             # Humble Tactician: row < col
+    CLUE_EAST: lambda r, c: c >= 6,                 # Western Cartographer: columns >= 6 (east of F)
+    CLUE_THREES: lambda r, c: r % 3 == 2,           # Three-Beat Chronomancer: row%3 == 2
+}
+
 
 # ---------- Basic types -----------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)  # no per-instance __dict__; fields are fixed
 class Player:  # noqa: D101
     name: str
     clue: str
     weight: int = 1
     color: Tuple[int, int, int] = (0, 0, 0)  # RGB for UI highlights
+    # grid_size -> allowed_positions result; the clue is fixed once loaded
+    _allowed_cache: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _clue_kind: int = field(default=0, init=False, repr=False, compare=False)  # Key into _CLUE_CELLS
+
+    def __post_init__(self) -> None:
+        self._clue_kind = _clue_kind(self.clue)  # Scan the clue text once, not per lookup
 
     def get_short_name(self) -> str:
         """Return the player's initial (first letter of name)."""
         return self.name[0].upper() if self.name else "?"
 
-    def allowed_positions(self, grid_size: int) -> set[tuple[int, int]]:
-        """Support specialized truth-based clue types by detecting keywords."""
-        clue = self.clue.lower()
-        # 1) Shallow-Sea Scout: rows 0 through 3
-        if "no deeper" in clue or "northern edge" in clue:
-            return {(r, c) for r in range(0, min(4, grid_size)) for c in range(grid_size)}
-        # 2) Prime Numerist: columns 2,3,5,7 (0-based primes)
-        if "prime sentinel" in clue or "prime" in clue:
-            primes = {2, 3, 5, 7}
-            return {(r, c) for r in range(grid_size) for c in primes if c < grid_size}
-        # 3) Parity Jester: (row+col)%2 == 1
-        if "odd laugh" in clue or "parity" in clue:
-            return {(r, c) for r in range(grid_size) for c in range(grid_size) if (r + c) % 2 == 1}
-        # 4) Humble Tactician: row < col
-        if "rank is strictly smaller" in clue or "bows to the column" in clue:
-            return {(r, c) for r in range(grid_size) for c in range(grid_size) if r < c}
-        # 5) Western Cartographer: columns >= 6 (east of F)
-        if "east of" in clue and "f" in clue:
-            return {(r, c) for r in range(grid_size) for c in range(6, grid_size)}
-        # 6) Three-Beat Chronomancer: row%3 == 2
-        if "second beat" in clue or "in threes" in clue or "chronomancer" in clue:
-            return {(r, c) for r in range(grid_size) for c in range(grid_size) if r % 3 == 2}
-        # Fallback: allow full grid
-        return {(r, c) for r in range(grid_size) for c in range(grid_size)}
-
-
-@dataclass
-class Treasure:  # noqa: D101
-    value: int
-    claimed: bool = False
-
-
-Grid = List[List[Optional[Treasure]]]
-Coalition = FrozenSet[int]  # index set → immutable & hashable
+    def allowed_positions(self, grid_size: int) -> int:
+        """Return the cells this player's clue allows as a board bitmask, computed once per *grid_size*.
+
+        Bit ``r * grid_size + c`` is set when cell (r, c) is allowed; see :func:`mask_has`.
+        """
+        mask = self._allowed_cache.get(grid_size)
+        if mask is None:
+            in_clue = _CLUE_CELLS[self._clue_kind]
+            mask = 0
+            for r in range(grid_size):
+                for c in range(grid_size):
+                    if in_clue(r, c):
+                        mask |= 1 << (r * grid_size + c)
+            self._allowed_cache[grid_size] = mask
+        return mask
+
+
+Grid = array  # flat row-major coin values, index r * size + c (0 = no treasure)
+REVEAL_MISS, REVEAL_HIT = 1, 2  # Reveal-map cell codes (0 = not guessed yet)
+
+Coalition = int  # bitmask: bit i set ⇔ player i is a member
+
+
+def mask_has(mask: int, r: int, c: int, grid_size: int) -> bool:
+    """Return True if board bitmask *mask* includes cell (r, c)."""
+    return bool(mask >> (r * grid_size + c) & 1)
+
+
+def mask_cells(mask: int, grid_size: int) -> Iterator[Tuple[int, int]]:
+    """Yield the (row, col) cells set in board bitmask *mask*, row-major."""
+    while mask:
+        low = mask & -mask
+        yield divmod(low.bit_length() - 1, grid_size)
+        mask ^= low
+
+
+def coalition_members(mask: Coalition) -> Iterator[int]:
+    """Yield the player indices set in coalition bitmask *mask*, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
 
 
 # ---------- JSON helpers ----------------------------------------------------
@@ -89,14 +141,12 @@ def load_clues(json_path: Path) -> List[Player]:
 
 
 def make_empty_grid(size: int) -> Grid:
-    """Return empty *size × size* grid of ``None``."""
-    return [[None for _ in range(size)] for _ in range(size)]
+    """Return flat *size × size* board with no treasure (all zeros)."""
+    return array('h', [0]) * (size * size)
 
 
 def load_board(json_path: Optional[Path], size: int) -> Grid:
     """Return grid populated with treasures; randomise if *json_path* missing."""
-    import random
-
     grid = make_empty_grid(size)
 
     if json_path and json_path.exists():
@@ -104,9 +154,15 @@ def load_board(json_path: Optional[Path], size: int) -> Grid:
         treasures = data.get("treasures", [])
         if treasures:
             t = treasures[0]
-            grid[t["row"]][t["col"]] = Treasure(value=t["value"])
+            row, col = t["row"], t["col"]
+            if not (0 <= row < size and 0 <= col < size):  # Flat index would land in the wrong cell
+                raise ValueError(f"Treasure at ({row}, {col}) is outside the {size}x{size} board")
+            value = t["value"]
+            if not 0 < value <= 32767:  # Must be a hit (> 0) and fit the array('h') board
+                raise ValueError(f"Treasure value {value} must be a positive coin amount")
+            grid[row * size + col] = value
     else:
         # Random scatter: place exactly one treasure with random coin value
         r, c = random.randrange(size), random.randrange(size)
-        grid[r][c] = Treasure(value=random.choice([20, 40, 60, 80]))
+        grid[r * size + c] = random.choice([20, 40, 60, 80])
     return grid
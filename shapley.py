@@ -1,31 +1,163 @@
+"""Fast Monte‑Carlo Shapley value estimator with optional clue *weights*.
 
-"""Fast Monte‑Carlo Shapley value estimator with optional clue *weights*."""
+Characteristic functions *v* are keyed by coalition bitmask: bit i set means
+player i is in the coalition.
+"""
 from __future__ import annotations
 
+import itertools
 import math
 import random
-from typing import Dict, FrozenSet, List
+import statistics
+from typing import Dict, List
+
+EXACT_MAX_PLAYERS = 10  # up to 2¹⁰ coalitions, exact enumeration beats sampling
+
+
+def _dense_table(v: Dict[int, int], n_players: int) -> List[int]:
+    """Return *v* as a list indexed by coalition bitmask (missing keys → 0)."""
+    table = [0] * (1 << n_players)
+    for mask, value in v.items():
+        table[mask] = value
+    return table
 
 
 def shapley_sample(
-    v: Dict[FrozenSet[int], int],
+    v: Dict[int, int],
     n_players: int,
     weights: List[int] | None = None,
     samples: int = 5000,
+    seed: int | None = None,
 ) -> List[float]:
-    """Return list φᵢ for *n_players* using *samples* random permutations."""
+    """Return list φᵢ for *n_players* using *samples* random permutations.
+
+    Pass *seed* for a reproducible estimate; it drives a private RNG, so the
+    global ``random`` state is left alone.  Games of at most
+    ``EXACT_MAX_PLAYERS`` players are solved exactly instead.
+    """
+    if n_players <= EXACT_MAX_PLAYERS:
+        return shapley_exact(v, n_players, weights)
+    v_table = _dense_table(v, n_players)
+    bits = [1 << i for i in range(n_players)]
+    φ = [0] * n_players  # v is integer-valued, so marginal sums stay exact ints
+    players = range(n_players)
+    sample = random.Random(seed).sample  # bound once, outside the hot loop
+
+    for _ in range(samples):
+        mask = 0
+        prev = v_table[0]
+        for i in sample(players, n_players):
+            mask |= bits[i]
+            cur = v_table[mask]
+            φ[i] += cur - prev
+            prev = cur
+
+    # φ is linear in the marginals, so weights and the mean apply once at the end
+    factor = 1.0 / samples
+    if weights is None:
+        return [x * factor for x in φ]
+    return [x * w * factor for x, w in zip(φ, weights)]
+
+
+def shapley_stratified(
+    v: Dict[int, int],
+    n_players: int,
+    weights: List[int] | None = None,
+    target_rmse: float = 0.1,
+    pilot: int = 8,
+    max_samples: int = 20000,
+    seed: int | None = None,
+) -> List[float]:
+    """Return φᵢ from size‑stratified antithetic samples, aiming at *target_rmse*.
+
+    A permutation and its reverse hand player *i* the predecessor sets S and
+    its complement, so each draw averages the marginals of stratum |S| = k and
+    its mirror n‑1‑k.  Draws per stratum follow Neyman allocation from the
+    spread seen in *pilot* draws; strata small enough are enumerated exactly.
+
+    *max_samples* is a hard cap on draws per player.  When the budget needed
+    for *target_rmse*, (spread / target_rmse)², exceeds it (with the defaults
+    this is typical from about six players up), the cap wins and the error is
+    larger than *target_rmse*.  Pass *seed* for a reproducible estimate; like
+    :func:`shapley_sample` it uses a private RNG and leaves ``random`` alone.
+    """
     if weights is None:
         weights = [1] * n_players
+    v_table = _dense_table(v, n_players)
+    full = (1 << n_players) - 1
+    m = n_players - 1  # number of possible predecessors
     φ = [0.0] * n_players
-    order = list(range(n_players))
+    sample = random.Random(seed).sample  # bound once; draw() runs up to max_samples times per player
 
-    for _ in range(samples):
-        random.shuffle(order)
-        S: FrozenSet[int] = frozenset()
-        for i in order:
-            marginal = (v.get(S | {i}, 0) - v.get(S, 0)) * weights[i]
-            φ[i] += marginal
-            S |= {i}
+    for i in range(n_players):
+        bit = 1 << i
+        rest = full ^ bit
+        others = [j for j in range(n_players) if j != i]
 
-    factor = 1.0 / samples
-    return [x * factor for x in φ]
+        def pair_marginal(S: int) -> float:
+            C = rest ^ S
+            return ((v_table[S | bit] - v_table[S]) + (v_table[C | bit] - v_table[C])) / 2
+
+        def draw(k: int) -> float:
+            S = 0
+            for j in sample(others, k):
+                S |= 1 << j
+            return pair_marginal(S)
+
+        # stratum k -> [coefficient, running sum, draw count, pilot stdev]
+        strata: Dict[int, List[float]] = {}
+        for k in range(m // 2 + 1):
+            coeff = (1.0 if 2 * k == m else 2.0) / n_players
+            if math.comb(m, k) <= pilot:
+                subsets = itertools.combinations(others, k)
+                vals = [pair_marginal(sum(1 << j for j in c)) for c in subsets]
+                strata[k] = [coeff, sum(vals), len(vals), 0.0]
+            else:
+                vals = [draw(k) for _ in range(pilot)]
+                strata[k] = [coeff, sum(vals), pilot, statistics.pstdev(vals)]
+
+        spread = sum(coeff * sd for coeff, _, _, sd in strata.values())
+        if spread > 0:
+            budget = max_samples if target_rmse <= 0 else min(max_samples, (spread / target_rmse) ** 2)
+            for k, (coeff, total, count, sd) in strata.items():
+                extra = int(math.ceil(budget * coeff * sd / spread)) - int(count)
+                for _ in range(max(0, extra)):
+                    total += draw(k)
+                    count += 1
+                strata[k][1:3] = [total, count]
+
+        φ[i] = weights[i] * sum(coeff * total / count for coeff, total, count, _ in strata.values())
+
+    return φ
+
+
+def shapley_exact(
+    v: Dict[int, int],
+    n_players: int,
+    weights: List[int] | None = None,
+) -> List[float]:
+    """Return exact φᵢ by splitting each coalition's Harsanyi dividend evenly.
+
+    Any game is a sum of unanimity games "v(S) = d_C if S ⊇ C"; the dividends
+    d_C come from a Möbius transform of *v* and each member of C earns d_C/|C|.
+    Costs O(n·2ⁿ), so it replaces sampling outright for small games.
+    """
+    if weights is None:
+        weights = [1] * n_players
+    dividends = _dense_table(v, n_players)
+    for i in range(n_players):
+        bit = 1 << i
+        for mask in range(1 << n_players):
+            if mask & bit:
+                dividends[mask] -= dividends[mask ^ bit]
+
+    φ = [0.0] * n_players
+    for mask in range(1, 1 << n_players):
+        d = dividends[mask]
+        if not d:
+            continue
+        share = d / bin(mask).count("1")
+        for i in range(n_players):
+            if mask >> i & 1:
+                φ[i] += share
+    return [w * x for w, x in zip(weights, φ)]
@@ -1,11 +1,14 @@
 """UI components (buttons, grid, panels) for the game – no external deps."""
 from __future__ import annotations
 
+import textwrap
+from itertools import compress
+
 import pygame as pg
-from typing import Callable, Tuple, List, Dict, Set, Optional
+from typing import Callable, Tuple, List, Dict, Sequence, Set, Optional
 
 # Assuming models.py has Player defined
-from models import Player
+from models import Player, Coalition, REVEAL_HIT, coalition_members, mask_cells
 
 pg.init()
 pg.font.init()  # Ensure font module is initialized
@@ -17,6 +20,35 @@ COLOR_INACTIVE = pg.Color('lightskyblue3')
 COLOR_ACTIVE = pg.Color('dodgerblue2')
 TEXT_COLOR = pg.Color('black')
 
+def _converted(surf: pg.Surface, alpha: bool = True) -> pg.Surface:
+    """Return *surf* in the display's pixel format so blits skip per-pixel conversion.
+
+    Keeps per-pixel alpha unless *alpha* is False; returned as-is while no display exists.
+    """
+    if pg.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+_glyphs: Dict[str, pg.Surface] = {}  # Character -> Font glyph in TEXT_COLOR, rendered on first use
+
+
+def _render_glyphs(text: str) -> pg.Surface:
+    """Return *text* in ``Font``/``TEXT_COLOR`` composed from cached per-character glyphs."""
+    glyphs = []
+    for ch in text:
+        glyph = _glyphs.get(ch)
+        if glyph is None:
+            glyph = _glyphs[ch] = _converted(Font.render(ch, True, TEXT_COLOR))
+        glyphs.append(glyph)
+    surf = pg.Surface((sum(g.get_width() for g in glyphs), Font.get_height()), pg.SRCALPHA)
+    x = 0
+    for glyph in glyphs:
+        surf.blit(glyph, (x, 0))
+        x += glyph.get_width()
+    return _converted(surf)
+
+
 # Simple TextInput for setup phase (can be expanded)
 class TextInput:
     def __init__(self, rect: pg.Rect, prompt: str):
@@ -25,29 +57,49 @@ class TextInput:
         self.text = ""
         self.active = False
         self.color = COLOR_INACTIVE
-        self.prompt_surface = Font.render(prompt, True, TEXT_COLOR)
-        self.txt_surface = Font.render(self.text, True, TEXT_COLOR)
+        self.prompt_surface = _converted(Font.render(prompt, True, TEXT_COLOR))
+        self.txt_surface = _render_glyphs(self.text)
+        self._fit_width()
+        self.needs_redraw = True  # Set when focus or text changes
+
+    def _fit_width(self):
+        # Make box slightly wider to fit text (before drawing, so layout is stable)
+        self.rect.w = max(200, self.txt_surface.get_width() + 10)
 
     def handle_event(self, event: pg.event.Event):
-        if event.type == pg.MOUSEBUTTONDOWN:
-            if self.rect.collidepoint(event.pos):
-                self.active = not self.active
-            else:
+        handler = self._HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def _on_mouse_down(self, event: pg.event.Event):
+        was_active = self.active
+        if self.rect.collidepoint(event.pos):
+            self.active = not self.active
+        else:
+            self.active = False
+        self.color = COLOR_ACTIVE if self.active else COLOR_INACTIVE
+        if self.active != was_active:
+            self.needs_redraw = True
+
+    def _on_key(self, event: pg.event.Event):
+        if self.active:
+            self.needs_redraw = True
+            if event.key == pg.K_RETURN:
+                print(f"Input finalized: {self.text}")  # Or call a callback
                 self.active = False
-            self.color = COLOR_ACTIVE if self.active else COLOR_INACTIVE
-        if event.type == pg.KEYDOWN:
-            if self.active:
-                if event.key == pg.K_RETURN:
-                    print(f"Input finalized: {self.text}")  # Or call a callback
-                    self.active = False
-                    self.color = COLOR_INACTIVE
-                elif event.key == pg.K_BACKSPACE:
-                    self.text = self.text[:-1]
-                else:
-                    # Allow letters, numbers, and spaces for names
-                    if event.unicode.isalnum() or event.unicode == ' ': 
-                        self.text += event.unicode
-                self.txt_surface = Font.render(self.text, True, TEXT_COLOR)
+                self.color = COLOR_INACTIVE
+            elif event.key == pg.K_BACKSPACE:
+                self.text = self.text[:-1]
+            else:
+                # Allow letters, numbers, and spaces for names
+                if event.unicode.isalnum() or event.unicode == ' ': 
+                    self.text += event.unicode
+            self.txt_surface = _render_glyphs(self.text)  # Cached glyphs, no per-keystroke rasterizing
+            self._fit_width()
+
+    # Event type -> handler; handle_event ignores anything else in one dict lookup
+    _HANDLERS = {pg.MOUSEBUTTONDOWN: _on_mouse_down, pg.KEYDOWN: _on_key}
+    WANTED_EVENTS = tuple(_HANDLERS)  # Event types handle_event reacts to
 
     def draw(self, screen: pg.Surface):
         # Draw prompt to the left of the box
@@ -55,8 +107,7 @@ class TextInput:
         # Draw the input box
         pg.draw.rect(screen, self.color, self.rect, 2)
         screen.blit(self.txt_surface, (self.rect.x + 5, self.rect.y + 5))
-        # Make box slightly wider to fit text
-        self.rect.w = max(200, self.txt_surface.get_width() + 10)
+        self.needs_redraw = False
 
     def get_text(self) -> str:
         return self.text
@@ -86,47 +137,89 @@ class Button:  # noqa: D101
         else:
             self.text_hover_color = text_hover_color
             
+        # Hover backgrounds are fixed once the colours are, so work them out here rather than per draw
+        self._hover_bg_color = tuple(min(c + 30, 255) for c in self.color)
+        self._active_hover_bg_color = tuple(min(c + 30, 255) for c in self.active_color)
+
         self.active = False  # Tracks toggle state
+        self.disabled = False  # Still drawn, but ignores all input while set
         self._is_hovered = False  # For visual feedback
+        self.needs_redraw = True  # Set when hover or toggle state changes
+        # Wrapped, pre-rendered text lines; rebuilt only when _layout_key changes
+        self._layout_key = None
+        self._layout: List[Tuple[pg.Surface, pg.Surface, Tuple[int, int], pg.Rect]] = []
 
     def handle_event(self, event: pg.event.Event) -> None:
-        if event.type == pg.MOUSEMOTION:
-            self._is_hovered = self.rect.collidepoint(event.pos)
-        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos):
-                if self.toggle:
-                    self.active = not self.active
-                self.onclick()
-                # Prevent immediate re-toggle on fast clicks for toggle buttons?
-                # Might need debounce logic if it becomes an issue.
+        if self.disabled:
+            return
+        handler = self._HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def _on_motion(self, event: pg.event.Event) -> None:
+        hovered = bool(self.rect.collidepoint(event.pos))
+        if hovered != self._is_hovered:
+            self._is_hovered = hovered
+            self.needs_redraw = True
+
+    def _on_mouse_down(self, event: pg.event.Event) -> None:
+        if event.button == 1 and self.rect.collidepoint(event.pos):
+            if self.toggle:
+                self.active = not self.active
+                self.needs_redraw = True
+            self.onclick()
+            # Prevent immediate re-toggle on fast clicks for toggle buttons?
+            # Might need debounce logic if it becomes an issue.
+
+    # Event type -> handler; handle_event ignores anything else in one dict lookup
+    _HANDLERS = {pg.MOUSEMOTION: _on_motion, pg.MOUSEBUTTONDOWN: _on_mouse_down}
+    WANTED_EVENTS = tuple(_HANDLERS)  # Event types handle_event reacts to
 
     def draw(self, surf: pg.Surface) -> None:
+        self.needs_redraw = False
         border_color = (0, 0, 0)
-        current_bg_color = self.color
-        current_text_color = self.text_color # Default text color
-
         if self.toggle and self.active:
-            current_bg_color = self.active_color
-
-        if self._is_hovered:
-            r, g, b = current_bg_color
-            hover_bg_color = (min(r + 30, 255), min(g + 30, 255), min(b + 30, 255))
-            pg.draw.rect(surf, hover_bg_color, self.rect)
-            current_text_color = self.text_hover_color # Use hover text color
+            bg_color = self._active_hover_bg_color if self._is_hovered else self.active_color
         else:
-            pg.draw.rect(surf, current_bg_color, self.rect)
+            bg_color = self._hover_bg_color if self._is_hovered else self.color
+        pg.draw.rect(surf, bg_color, self.rect)
 
         pg.draw.rect(surf, border_color, self.rect, 2)  # Draw border
 
+        # Blit the cached text lines, hover colour when hovered
+        hovered = self._is_hovered
+        x, y = self.rect.topleft
+        for line_surf, line_hover_surf, (dx, dy), source_area in self._text_layout():
+            surf.blit(line_hover_surf if hovered else line_surf, (x + dx, y + dy), area=source_area)
+
+    def _text_layout(self) -> List[Tuple[pg.Surface, pg.Surface, Tuple[int, int], pg.Rect]]:
+        """Return the wrapped text lines as (normal, hover, offset, area), relative to the rect.
+
+        Wrapping and rendering only rerun when the text, size, font or colours change;
+        moving the button keeps the cached layout.
+        """
+        key = (self.text, self.rect.size, id(self.font), self.text_color, self.text_hover_color)
+        if key == self._layout_key:
+            return self._layout
+        self._layout_key = key
+        self._layout = []
+
+        if not self.text.strip():
+            return self._layout # Nothing to draw if text is empty
+
         # --- Text Wrapping ---
         padding = 5
         max_width = self.rect.width - 2 * padding
-        words = self.text.split(' ')
         lines = []
+        char_w = self.font.size("M")[0]
+
+        if self.font.size("i")[0] == char_w:
+            # Monospace (the default Consolas): wrap by character count, no per-word measuring
+            lines = textwrap.wrap(self.text, max(1, max_width // char_w), break_long_words=False, break_on_hyphens=False)
+            words = []
+        else:
+            words = self.text.split(' ')
         current_line = ""
-        
-        if not self.text.strip():
-            return # Nothing to draw if text is empty
 
         for word in words:
             test_line = current_line + (" " if current_line else "") + word
@@ -147,21 +240,26 @@ class Button:  # noqa: D101
         if current_line: # Add the last line
             lines.append(current_line)
 
-        # --- Render and Blit Lines ---
+        # --- Render Lines (both colours) and clip against the button ---
+        local_rect = pg.Rect((0, 0), self.rect.size)
         line_height = self.font.get_linesize()
         total_height = len(lines) * line_height
-        start_y = self.rect.centery - total_height // 2
+        start_y = local_rect.centery - total_height // 2
 
         for i, line in enumerate(lines):
-            line_surf = self.font.render(line, True, current_text_color)
-            line_rect = line_surf.get_rect(centerx=self.rect.centerx, top=start_y + i * line_height)
+            line_surf = _converted(self.font.render(line, True, self.text_color))
+            line_hover_surf = _converted(self.font.render(line, True, self.text_hover_color))
+            line_rect = line_surf.get_rect(centerx=local_rect.centerx, top=start_y + i * line_height)
 
-            # Clip and draw
-            clip_rect = line_rect.clip(self.rect)
+            clip_rect = line_rect.clip(local_rect)
             source_area = clip_rect.move(-line_rect.left, -line_rect.top)
             
             if clip_rect.width > 0 and clip_rect.height > 0:
-                surf.blit(line_surf, clip_rect.topleft, area=source_area)
+                self._layout.append((line_surf, line_hover_surf, clip_rect.topleft, source_area))
+        return self._layout
+
+
+_value_surfs: Dict[int, pg.Surface] = {}  # Coin value -> rendered label, shared by all boards
 
 
 class GridView:  # noqa: D101
@@ -175,9 +273,71 @@ class GridView:  # noqa: D101
         self.x0, self.y0 = topleft
         self.size_px, self.n, self.onclick = size_px, n, onclick
         self.cell_size = size_px // n
+        self.rect = pg.Rect(self.x0, self.y0, size_px, size_px)  # Board area (labels sit outside)
+        self.needs_redraw = True  # Set by the owner when board contents change
+
+        # Fixed geometry, computed once: line offsets, then per-cell rects/centres (flat, index r * n + c)
+        cs = self.cell_size
+        self._col_x = [self.x0 + i * cs for i in range(n + 1)]
+        self._row_y = [self.y0 + i * cs for i in range(n + 1)]
+        self.cell_rects = [pg.Rect(self._col_x[c], self._row_y[r], cs, cs) for r in range(n) for c in range(n)]
+        self.cell_centers = [rect.center for rect in self.cell_rects]
+        self._grid_overlay = self._build_grid_overlay()
+        # Translucent highlight for allowed guess cells, reused for every cell
+        hl = pg.Surface((cs, cs), pg.SRCALPHA)
+        hl.fill((0, 255, 0, 50))  # semi-transparent green
+        self._allowed_hl = _converted(hl)
+        self._labels = self._build_labels()
+        self._clue_overlays: Dict[Tuple[int, Tuple[int, int, int]], pg.Surface] = {}  # See _clue_overlay
+
+    def _build_grid_overlay(self) -> pg.Surface:
+        """Return the grid lines pre-drawn on a transparent surface placed at (x0, y0)."""
+        line_color = (100, 100, 100)  # Grey grid lines
+        line_thickness = 1 # Reverted thickness
+        overlay = pg.Surface((self.size_px + 1, self.size_px + 1), pg.SRCALPHA)  # +1: closing edge line
+        for x in self._col_x:
+            x -= self.x0
+            pg.draw.line(overlay, line_color, (x, 0), (x, self.size_px), line_thickness)
+        for y in self._row_y:
+            y -= self.y0
+            pg.draw.line(overlay, line_color, (0, y), (self.size_px, y), line_thickness)
+        return _converted(overlay)
+
+    def _clue_overlay(self, positions: int, color: Tuple[int, int, int]) -> pg.Surface:
+        """Return a transparent board-sized surface outlining every cell in mask *positions*."""
+        key = (positions, tuple(color))
+        overlay = self._clue_overlays.get(key)
+        if overlay is None:
+            outline_thickness = 3 
+            overlay = pg.Surface((self.size_px, self.size_px), pg.SRCALPHA)
+            for (r_idx, c_idx) in mask_cells(positions, self.n):
+                pg.draw.rect(overlay, color, self.cell_rects[r_idx * self.n + c_idx].move(-self.x0, -self.y0), outline_thickness)
+            overlay = self._clue_overlays[key] = _converted(overlay)
+        return overlay
+
+    def _build_labels(self) -> List[Tuple[pg.Surface, Tuple[int, int]]]:
+        """Return the column (A, B, ...) and row (1, 2, ...) labels rendered once, with positions."""
+        label_margin = 8 # Increased margin for labels
+        labels = []
+        for c in range(self.n):
+            label_surf = _converted(FontSmall.render(chr(ord('A') + c), True, TEXT_COLOR))
+            x = self.cell_centers[c][0]
+            y = self.y0 - label_surf.get_height() // 2 - label_margin
+            labels.append((label_surf, (x - label_surf.get_width() // 2, y)))
+        for r in range(self.n):
+            label_surf = _converted(FontSmall.render(str(r + 1), True, TEXT_COLOR))
+            x = self.x0 - label_surf.get_width() // 2 - label_margin
+            y = self.cell_centers[r * self.n][1] - label_surf.get_height() // 2
+            labels.append((label_surf, (x, y)))
+        return labels
 
     def handle_event(self, event: pg.event.Event) -> None:  # noqa: D401, D102
-        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+        handler = self._HANDLERS.get(event.type)
+        if handler:
+            handler(self, event)
+
+    def _on_mouse_down(self, event: pg.event.Event) -> None:
+        if event.button == 1:
             x, y = event.pos
             if self.x0 <= x < self.x0 + self.size_px and self.y0 <= y < self.y0 + self.size_px:
                 r = (y - self.y0) // self.cell_size
@@ -186,18 +346,25 @@ class GridView:  # noqa: D101
                 if 0 <= r < self.n and 0 <= c < self.n:
                     self.onclick(r, c)
 
+    # Event type -> handler; handle_event ignores anything else in one dict lookup
+    _HANDLERS = {pg.MOUSEBUTTONDOWN: _on_mouse_down}
+    WANTED_EVENTS = tuple(_HANDLERS)  # Event types handle_event reacts to
+
     def draw(
         self,
         surf: pg.Surface,
-        revealed: List[Tuple[int, int, bool]],
-        grid: List[List[Optional['Treasure']]],
-        allowed: Optional[Set[Tuple[int, int]]] = None,
-        clue_positions: List[Tuple[int, Set[Tuple[int, int]], bool]] = None,
+        reveal_map: Sequence[int],
+        treasure_value: Sequence[int],
+        treasure_claimed: Sequence[int],
+        allowed: Optional[int] = None,
+        clue_positions: List[Tuple[int, int, bool]] = None,
         players: Optional[List['Player']] = None,
+        claimed: Optional[Sequence[int]] = None,
     ) -> None:
+        """Paint the board; *claimed* optionally lists the set indices of *treasure_claimed*, saving the scan."""
+        self.needs_redraw = False
         # Board background
-        bg_rect = pg.Rect(self.x0, self.y0, self.size_px, self.size_px)
-        pg.draw.rect(surf, (20, 20, 20), bg_rect)  # Dark background for the grid
+        pg.draw.rect(surf, (20, 20, 20), self.rect)  # Dark background for the grid
 
         # Player-specific clue outlines (each player gets a different color)
         if clue_positions:
@@ -213,87 +380,60 @@ class GridView:  # noqa: D101
                 outline_color = player_color 
 
                 if is_restrictive:
-                    # Restrictive: Draw outlines for specific cells directly onto the main surface
-                    outline_thickness = 3 
-                    for (r_idx, c_idx) in positions:
-                        cell_x = self.x0 + c_idx * self.cell_size
-                        cell_y = self.y0 + r_idx * self.cell_size
-                        cell_rect = pg.Rect(cell_x, cell_y, self.cell_size, self.cell_size)
-                        # Draw directly onto surf, no intermediate alpha surface
-                        pg.draw.rect(surf, outline_color, cell_rect, outline_thickness) 
+                    # Restrictive: outline the specific cells, pre-drawn once per (cells, colour)
+                    surf.blit(self._clue_overlay(positions, outline_color), self.rect)
                 else:
                     # Non-restrictive: Draw outline around the entire grid perimeter
-                    perimeter_rect = pg.Rect(self.x0, self.y0, self.size_px, self.size_px)
                     outline_thickness = 4 
-                    pg.draw.rect(surf, outline_color, perimeter_rect, outline_thickness)
+                    pg.draw.rect(surf, outline_color, self.rect, outline_thickness)
 
         # Highlight allowed guess cells
         if allowed is not None:
-            # translucent highlight surface
-            hl = pg.Surface((self.cell_size, self.cell_size), pg.SRCALPHA)
-            hl.fill((0, 255, 0, 50))  # semi-transparent green
-            for (r, c) in allowed:
-                rect = pg.Rect(
-                    self.x0 + c * self.cell_size,
-                    self.y0 + r * self.cell_size,
-                    self.cell_size,
-                    self.cell_size,
-                )
-                surf.blit(hl, rect.topleft)
-
-        # Draw revealed treasures first (optional)
-        for r in range(self.n):
-            for c in range(self.n):
-                cell_rect = pg.Rect(self.x0 + c * self.cell_size, self.y0 + r * self.cell_size, self.cell_size, self.cell_size)
-                cell = grid[r][c]
-                if cell and cell.claimed:
-                    # Draw a coin or value perhaps?
-                    coin_color = (255, 215, 0)  # Gold
-                    pg.draw.circle(surf, coin_color, cell_rect.center, self.cell_size // 4)
-                    value_txt = FontSmall.render(str(cell.value), True, (0, 0, 0))
-                    txt_rect = value_txt.get_rect(center=cell_rect.center)
-                    surf.blit(value_txt, txt_rect)
+            hl = self._allowed_hl
+            for (r, c) in mask_cells(allowed, self.n):
+                surf.blit(hl, self.cell_rects[r * self.n + c])
+
+        # Draw revealed treasures first (flat row-major arrays, index r * n + c);
+        # compress() picks the set cells out in C, so empty cells cost no Python bytecode
+        cells = range(len(self.cell_centers))
+        if claimed is None:
+            claimed = compress(cells, treasure_claimed)
+        for idx in claimed:
+            center = self.cell_centers[idx]
+            # Draw a coin or value perhaps?
+            coin_color = (255, 215, 0)  # Gold
+            pg.draw.circle(surf, coin_color, center, self.cell_size // 4)
+            value = treasure_value[idx]
+            value_txt = _value_surfs.get(value)
+            if value_txt is None:
+                value_txt = _value_surfs[value] = _converted(FontSmall.render(str(value), True, (0, 0, 0)))
+            txt_rect = value_txt.get_rect(center=center)
+            surf.blit(value_txt, txt_rect)
 
         # Draw hit/miss markers over treasure display
-        for r, c, hit in revealed:
-            center = (
-                self.x0 + c * self.cell_size + self.cell_size // 2,
-                self.y0 + r * self.cell_size + self.cell_size // 2,
-            )
-            color = (34, 139, 34) if hit else (178, 34, 34)  # Green for hit, Red for miss
-            pg.draw.circle(surf, color, center, self.cell_size // 3)
+        # Split by colour first, so each loop below is a bare run of draw calls
+        centers = self.cell_centers
+        revealed = list(compress(cells, reveal_map))
+        hits = [centers[idx] for idx in revealed if reveal_map[idx] == REVEAL_HIT]
+        misses = [centers[idx] for idx in revealed if reveal_map[idx] != REVEAL_HIT]
+        radius = self.cell_size // 3
+        for center in hits:
+            pg.draw.circle(surf, (34, 139, 34), center, radius)  # Green for hit
+        for center in misses:
+            pg.draw.circle(surf, (178, 34, 34), center, radius)  # Red for miss
             # Optionally draw an X for miss, checkmark for hit?
             # ... (add drawing code here if desired)
 
         # Grid lines (draw last, on top)
-        line_color = (100, 100, 100)  # Grey grid lines
-        line_thickness = 1 # Reverted thickness
-        label_margin = 8 # Increased margin for labels
-        for i in range(self.n + 1):
-            # verticals
-            pg.draw.line(surf, line_color, (self.x0 + i * self.cell_size, self.y0), (self.x0 + i * self.cell_size, self.y0 + self.size_px), line_thickness)
-            # horizontals
-            pg.draw.line(surf, line_color, (self.x0, self.y0 + i * self.cell_size), (self.x0 + self.size_px, self.y0 + i * self.cell_size), line_thickness)
-        # Draw column labels (A, B, C, ...)
-        for c in range(self.n):
-            letter = chr(ord('A') + c)
-            label_surf = FontSmall.render(letter, True, TEXT_COLOR)
-            x = self.x0 + c * self.cell_size + self.cell_size // 2
-            # Adjusted y for increased margin
-            y = self.y0 - label_surf.get_height() // 2 - label_margin 
-            surf.blit(label_surf, (x - label_surf.get_width() // 2, y))
-        # Draw row labels (1, 2, 3, ...)
-        for r in range(self.n):
-            number = str(r + 1)
-            label_surf = FontSmall.render(number, True, TEXT_COLOR)
-            # Adjusted x for increased margin
-            x = self.x0 - label_surf.get_width() // 2 - label_margin
-            y = self.y0 + r * self.cell_size + self.cell_size // 2 - label_surf.get_height() // 2
-            surf.blit(label_surf, (x, y))
+        surf.blit(self._grid_overlay, (self.x0, self.y0))
+        # Column and row labels, rendered once in __init__
+        surf.blits(self._labels)
 
 
 # --- NEW: PlayerPanel --- needs Player from models.py
 class PlayerPanel:
+    ROW_H = 35  # Height for each player row
+
     def __init__(self, rect: pg.Rect, players: List[Player], commit_callback: Callable[[int], None]):
         self.rect = rect
         self.players = players
@@ -301,12 +441,24 @@ class PlayerPanel:
         self.commit_states = [False] * len(players)
         self.reveal_coalition: Set[int] = set()
         self.buttons: List[Button] = []
+        self._dirty = True
         self._create_player_widgets()
 
+    @property
+    def needs_redraw(self) -> bool:
+        """True if the panel or any of its commit toggles changed since the last draw."""
+        return self._dirty or any(button.needs_redraw for button in self.buttons)
+
     def _create_player_widgets(self):
         self.buttons = []
+        # Static part of the panel (background, border, names, clues), composited once;
+        # only the commit toggles are drawn live on top
+        self._cache_surf = _converted(pg.Surface(self.rect.size), alpha=False)
+        self._cache_surf.fill((220, 220, 220))  # Light grey background
+        pg.draw.rect(self._cache_surf, (0, 0, 0), self._cache_surf.get_rect(), 1)  # Border
+        self._hover_idx: Optional[int] = None  # Row of the toggle currently hovered
         y_offset = self.rect.y + 5
-        widget_h = 35  # Height for each player row
+        widget_h = self.ROW_H
         toggle_w = 20
         name_w = 100
 
@@ -318,99 +470,113 @@ class PlayerPanel:
             commit_button = Button(toggle_rect, "", callback, toggle=True, color=(200, 200, 200), active_color=player.color)
             self.buttons.append(commit_button)
 
-            # Player Name/Initial Label (drawn directly)
-            # Clue Text Label (drawn conditionally)
+            # Player Name/Initial and Clue labels, rendered once (names are final by now)
+            name_txt = Font.render(f"{player.get_short_name()}: {player.name}", True, player.color)
+            clue_txt = FontSmall.render(f"   Clue: {player.clue}", True, (50, 50, 50))
+            row_y = y_offset - self.rect.y
+            self._cache_surf.blit(name_txt, (30, row_y + 8))
+            self._cache_surf.blit(clue_txt, (30, row_y + 22))
             y_offset += widget_h
+        self._toggles_enabled = True  # False while commits are locked; handle_event then ignores input
 
     def update_commits(self, commit_states: List[bool]):
         self.commit_states = commit_states
         for i, button in enumerate(self.buttons):
             button.active = commit_states[i]
+        self._dirty = True
 
     def reveal_clues(self, coalition_indices: Set[int]):
         self.reveal_coalition = coalition_indices
-        # Disable toggles after revealing?
-        # for button in self.buttons: button.disabled = True # Need to add disabled state to Button
+        self._set_toggles_enabled(False) # Commits are locked in once clues are revealed
+        self._dirty = True
+
+    def _set_toggles_enabled(self, enabled: bool):
+        """Enable or disable every commit toggle; disabled toggles still draw but ignore input."""
+        for button in self.buttons:
+            button.disabled = not enabled
+            if not enabled and button._is_hovered: # Don't leave a dead toggle highlighted
+                button._is_hovered = False
+                button.needs_redraw = True
+        self._hover_idx = None
+        self._toggles_enabled = enabled
 
     def reset_view(self):
         self.reveal_coalition = set()
         self.commit_states = [False] * len(self.players)
         for button in self.buttons:
             button.active = False
-            # button.disabled = False # Re-enable toggles
+        self._set_toggles_enabled(True) # Re-enable toggles
+        self._dirty = True
 
     def handle_event(self, event: pg.event.Event):
-        for button in self.buttons:
-            button.handle_event(event)
-
-    def draw(self, screen: pg.Surface):
-        pg.draw.rect(screen, (220, 220, 220), self.rect)  # Light grey background
-        pg.draw.rect(screen, (0, 0, 0), self.rect, 1)  # Border
-        y_offset = self.rect.y + 5
-        widget_h = 35
-
-        # --- Determine which clues are restrictive (useful) ---
-        all_committed = len(self.reveal_coalition) == len(self.players) and len(self.players) > 0
-        grid_size = 10  # Default, or could be passed in
-        clue_types = []
-        if all_committed:
-            for player in self.players:
-                pos = player.allowed_positions(grid_size)
-                if len(pos) == grid_size * grid_size:
-                    clue_types.append('nonrestrictive')
-                else:
-                    clue_types.append('restrictive')
+        if not self._toggles_enabled or event.type not in Button.WANTED_EVENTS:
+            return # Nothing for the toggles
+        # One toggle per row, so only the row under the pointer can react
+        idx = (event.pos[1] - self.rect.y - 5) // self.ROW_H
+        if not 0 <= idx < len(self.buttons):
+            idx = None
         else:
-            clue_types = [None] * len(self.players)
-
-        for i, player in enumerate(self.players):
-            # Draw Commit Toggle
-            self.buttons[i].draw(screen)
-
-            # Draw Player Name
-            name_color = player.color if hasattr(player, 'color') else (0, 0, 0)
-            name_txt = Font.render(f"{player.get_short_name()}: {player.name}", True, name_color)
-            name_pos = (self.rect.x + 30, y_offset + 8)
-            screen.blit(name_txt, name_pos)
+            self.buttons[idx].handle_event(event)
+        if event.type == pg.MOUSEMOTION:
+            # ...plus the previously hovered toggle, so it can clear its hover state
+            if self._hover_idx is not None and self._hover_idx != idx:
+                self.buttons[self._hover_idx].handle_event(event)
+            self._hover_idx = idx if idx is not None and self.buttons[idx]._is_hovered else None
 
-            # Always show Clue
-            clue_txt = FontSmall.render(f"   Clue: {player.clue}", True, (50, 50, 50))
-            clue_pos = (self.rect.x + 30, y_offset + 22)
-            screen.blit(clue_txt, clue_pos)
+    def draw(self, screen: pg.Surface):
+        self._dirty = False
+        screen.blit(self._cache_surf, self.rect)  # Background, border, names and clues
 
-            y_offset += widget_h
+        # Draw Commit Toggles (hover/toggle state changes, so never cached)
+        for button in self.buttons:
+            button.draw(screen)
 
 
 class LedgerPanel:  # noqa: D101
     def __init__(self, rect: pg.Rect):
         self.rect = rect
         self.scroll = 0
+        self.needs_redraw = True  # Set by the owner when the ledger changes; also marks the cache stale
         self.font = Font
         self.font_small = FontSmall
-
-    def draw(self, surf: pg.Surface, ledger_items: List[Tuple[Coalition, int]], players: List[Player]):
-        pg.draw.rect(surf, (245, 245, 245), self.rect)  # Background
-        pg.draw.rect(surf, (0, 0, 0), self.rect, 2)  # Border
-        header = self.font.render("Coalition      Coins", True, (0, 0, 0))
-        surf.blit(header, (self.rect.x + 4, self.rect.y + 4))
-        pg.draw.line(surf, (150, 150, 150), (self.rect.x, self.rect.y + 22), (self.rect.right, self.rect.y + 22), 1)
-
-        y = self.rect.y + 26 - self.scroll
-        max_y = self.rect.bottom - 5
+        self._cache_surf = _converted(pg.Surface(self.rect.size), alpha=False)  # Composited panel, reused until the ledger changes
+        self._header = _converted(self.font.render("Coalition      Coins", True, (0, 0, 0)))
+        self._row_surfs: Dict[Tuple[Coalition, int], pg.Surface] = {}  # (coalition, coins) -> rendered row
+        self._row_names: List[str] = []  # short_names the cached rows were rendered with
+
+    def draw(self, surf: pg.Surface, ledger_items: List[Tuple[Coalition, int]], short_names: List[str]):
+        if self.needs_redraw:
+            self._render_to(self._cache_surf, ledger_items, short_names)
+            self.needs_redraw = False
+        surf.blit(self._cache_surf, self.rect)
+
+    def _render_to(self, target: pg.Surface, ledger_items: List[Tuple[Coalition, int]], short_names: List[str]):
+        """Paint the whole panel onto *target*, in coordinates local to the panel."""
+        rect = target.get_rect()
+        pg.draw.rect(target, (245, 245, 245), rect)  # Background
+        pg.draw.rect(target, (0, 0, 0), rect, 2)  # Border
+        target.blit(self._header, (rect.x + 4, rect.y + 4))
+        pg.draw.line(target, (150, 150, 150), (rect.x, rect.y + 22), (rect.right, rect.y + 22), 1)
+
+        y = rect.y + 26 - self.scroll
+        max_y = rect.bottom - 5
+
+        if short_names != self._row_names:  # New players: cached rows are stale
+            self._row_surfs.clear()
+            self._row_names = list(short_names)
 
         # Draw ledger entries (newest first)
-        for coalition_indices, coins in reversed(ledger_items):
-            if y < self.rect.y + 24: break  # Don't draw above header
+        for mask, coins in reversed(ledger_items):
+            if y < rect.y + 24: break  # Don't draw above header
             if y > max_y: continue  # Simple clipping
 
-            # Map indices to player short names
-            try:
-                names = "+".join(sorted(players[i].get_short_name() for i in coalition_indices))
-            except IndexError:
-                names = "ErrorIdx"  # Handle potential index error if players list changes
-            except AttributeError:
-                names = "NoShortName"  # Handle if get_short_name is missing
-
-            txt = self.font_small.render(f"{names:<13} {coins:>5}", True, (0, 0, 0))
-            surf.blit(txt, (self.rect.x + 4, y))
+            txt = self._row_surfs.get((mask, coins))
+            if txt is None:
+                # Map indices to player short names
+                try:
+                    names = "+".join(sorted(short_names[i] for i in coalition_members(mask)))
+                except IndexError:
+                    names = "ErrorIdx"  # Handle potential index error if players list changes
+                txt = self._row_surfs[(mask, coins)] = _converted(self.font_small.render(f"{names:<13} {coins:>5}", True, (0, 0, 0)))
+            target.blit(txt, (rect.x + 4, y))
             y += 16  # Smaller font, less spacing